@@ -1,40 +1,71 @@
-from dash import html, dcc, Dash, Output, Input, State
+from dash import html, dcc, Dash, Output, Input
+from flask.json.provider import DefaultJSONProvider
+import orjson
 
 from pages import data_entry, results
 
 
-app = Dash(__name__, suppress_callback_exceptions=True)
-server = app.server
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider using orjson to decode callback requests."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+
+    def loads(self, s: str | bytes, **kwargs):
+        return orjson.loads(s)
+
+
+def create_app() -> Dash:
+    """Create the Dash app with its layout and callbacks."""
+    app = Dash(__name__, suppress_callback_exceptions=True)
+    app.server.json = OrjsonProvider(app.server)
+
+    app.layout = html.Div([
+        dcc.Location(id="url"),
+
+        # Session storage
+        dcc.Store(id="session-input-data", storage_type="session"),  # Stores user input data
+        dcc.Store(id="navigation-trigger", storage_type="memory"),  # Allows navigation between tabs
 
-app.layout = html.Div([
-    dcc.Location(id="url"),
-
-    # Session storage
-    dcc.Store(id="session-input-data", storage_type="session"),  # Stores user input data
-    dcc.Store(id="navigation-trigger", storage_type="memory"),  # Allows navigation between tabs
-
-    # Page layout
-    html.H1('Exposure Assessment Dashboard'),
-    dcc.Tabs(id="navigation-tabs", children=[
-        dcc.Tab(label='Data entry', value='data-entry'),
-        dcc.Tab(label='Exposure results', value='exposure-results', id='results-tab', disabled=True),
-    ]),
-    html.Div(id="page-content")  # Placeholder for page content
-])
-
-
-@app.callback(
-    Output("page-content", "children"),
-    Input("navigation-tabs", "value"),
-    State('session-input-data', 'data')
-)
-def render_main_content(tab, session_data):
-    if tab == "data-entry":
-        return data_entry.layout(session_data)
-    elif tab == "exposure-results":
-        return results.layout(session_data)
-
-    raise ValueError("Invalid tab")
+        # Page layout
+        html.H1('Exposure Assessment Dashboard'),
+        dcc.Tabs(id="navigation-tabs", value="data-entry", children=[
+            dcc.Tab(label='Data entry', value='data-entry'),
+            dcc.Tab(label='Exposure results', value='exposure-results', id='results-tab', disabled=True),
+        ]),
+
+        # Both pages are rendered up front and shown or hidden by the selected tab
+        html.Div(data_entry.layout(), id="data-entry-page"),
+        html.Div(results.layout(), id="exposure-results-page", style={"display": "none"}),
+    ])
+
+    # Switch pages in the browser rather than rebuilding them on the server
+    app.clientside_callback(
+        """
+        function(tab) {
+            return [
+                {display: tab === 'data-entry' ? 'block' : 'none'},
+                {display: tab === 'exposure-results' ? 'block' : 'none'},
+            ];
+        }
+        """,
+        Output("data-entry-page", "style"),
+        Output("exposure-results-page", "style"),
+        Input("navigation-tabs", "value"),
+    )
+
+    data_entry.register_callbacks(app)
+    results.register_callbacks(app)
+
+    return app
+
+
+app = create_app()
+server = app.server
 
 
 if __name__ == "__main__":
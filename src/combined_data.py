@@ -0,0 +1,159 @@
+"""
+Module for querying the combined data and the files derived from it.
+
+Nothing is loaded when this module is imported, so the build tools can use it
+without loading the categories table, see data.py.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import polars as pl
+
+
+DEFAULT_LOCAL_PATH = Path().resolve() / 'data'
+DATA_DIR = Path(os.getenv('DATA_DIR', DEFAULT_LOCAL_PATH))
+DATA_PATH = DATA_DIR / 'combined_data.parquet'
+
+# Combined data presorted by group code as uncompressed Arrow IPC, see
+# tools/prepare_data.py
+SORTED_DATA_PATH = DATA_DIR / 'combined_data.sorted.arrow'
+
+# Precomputed categories table, see tools/build_categories.py
+CATEGORIES_PATH = DATA_DIR / 'categories.arrow'
+CATEGORIES_JSON_PATH = DATA_DIR / 'categories.json'
+
+# Number of bytes at the end of the parquet file hashed to identify it. This
+# covers the footer, which holds the schema and row group statistics.
+SOURCE_FOOTER_SIZE = 64 * 1024
+
+
+def source_stamp() -> dict | None:
+    """Identify the combined data by its size and a hash of its footer.
+
+    Unlike modification times, this still matches after the files are copied.
+    Returns None if the parquet file is missing.
+    """
+    try:
+        with open(DATA_PATH, 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(size - SOURCE_FOOTER_SIZE, 0))
+            footer = f.read()
+    except FileNotFoundError:
+        return None
+
+    return {'size': size, 'footer_sha256': hashlib.sha256(footer).hexdigest()}
+
+
+def stamp_path(path: Path) -> Path:
+    """Path of the file recording which combined data a derived file was built from."""
+    return path.with_name(f'{path.name}.source.json')
+
+
+def write_source_stamp(path: Path) -> None:
+    """Record the combined data that a derived file was built from."""
+    stamp_path(path).write_text(json.dumps(source_stamp()))
+
+
+def is_current(path: Path) -> bool:
+    """Check whether a file derived from the combined data is up to date.
+
+    A derived file is up to date if it was built from the current parquet file.
+    Deployments may ship only the derived files, in which case they are used
+    as they are.
+    """
+    if not path.exists():
+        return False
+
+    stamp = source_stamp()
+    if stamp is None:
+        return True
+
+    try:
+        return json.loads(stamp_path(path).read_text()) == stamp
+    except FileNotFoundError:
+        return False
+
+
+def get_lf() -> pl.LazyFrame:
+    """Loads the combined data from the parquet file as a LazyFrame.
+
+    Uses the memory-mapped copy presorted by group code when it is up to date
+    or when it is the only copy, which avoids decoding the parquet file.
+    """
+    if is_current(SORTED_DATA_PATH):
+        return pl.scan_ipc(SORTED_DATA_PATH, memory_map=True)
+
+    return pl.scan_parquet(DATA_PATH)
+
+
+def group_code_segments() -> pl.Expr:
+    """Split group codes into their segments."""
+    return pl.col("Group Code").str.strip_chars(".").str.split(".")
+
+
+def group_code_segment_width(lf: pl.LazyFrame) -> int:
+    """Get the length of the longest group code segment."""
+    width = lf.select(
+        group_code_segments().list.eval(pl.element().str.len_chars()).list.max().max()
+    ).collect().item()
+
+    return width or 1
+
+
+def group_code_sort_key(width: int) -> pl.Expr:
+    """Key to sort group codes lexicographically by their numeric segments.
+
+    Each segment is zero padded to `width` so the key can be sorted as a plain
+    string, which is cheaper than comparing lists of integers. The width must be
+    at least the length of the longest segment, see group_code_segment_width.
+    """
+    return (
+        group_code_segments()
+        .list.eval(pl.element().str.zfill(width))
+        .list.join(".")
+    )
+
+
+def build_categories_table() -> pl.DataFrame:
+    """Build the initial categories table from the combined data."""
+    presorted = is_current(SORTED_DATA_PATH)
+
+    lf = (
+        get_lf()
+        .select(['Group Code', 'Group Name'])
+
+        # Remove group codes that don't look like x.y.z: only digits and dots,
+        # starting with a digit and without empty segments. Filtering before
+        # unique keeps invalid rows out of its hash table.
+        .filter(
+            pl.col('Group Code').str.contains(r'^[0-9.]+$')
+            & pl.col('Group Code').str.contains(r'^[0-9]')
+            & ~pl.col('Group Code').str.contains('..', literal=True)
+        )
+
+        # Unique entries, keeping the order of presorted data
+        .unique(maintain_order=presorted)
+    )
+
+    if not presorted:
+        # Sort lexicographically by group code. The unique group codes are few,
+        # so they are collected once to find the width of their segments.
+        lf = lf.collect(engine='streaming').lazy()
+        width = group_code_segment_width(lf)
+        lf = (
+            lf.with_columns(group_code_sort_key(width).alias("_sort_key"))
+            .sort("_sort_key")
+            .drop("_sort_key")
+        )
+
+    # Add initial values for the input table
+    lf = lf.with_columns([
+        pl.lit(None, dtype=pl.Float64).alias('Use level (mg/kg)'),
+        pl.lit(False, dtype=pl.Boolean).alias('Consumers of')
+    ])
+
+    # Only two columns are projected from the scan, so stream the query rather
+    # than loading the whole file into memory
+    return lf.collect(engine='streaming')
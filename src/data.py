@@ -1,49 +1,42 @@
 """
-Module for loading and processing combined data from a parquet file.
+Module for loading the categories table from the combined data.
+
+The table is loaded when this module is imported. Tools that only need the
+paths or queries should import combined_data instead.
 """
-import os
-from pathlib import Path
-from functools import cache
+from typing import Final
 
 import polars as pl
 
+from combined_data import CATEGORIES_PATH, build_categories_table, is_current
+
+
+def load_categories_table() -> pl.DataFrame:
+    """Load the initial categories table with group codes and names.
+
+    Uses the precomputed Arrow IPC artifact when it is up to date, falling back
+    to building the table from the parquet file.
+    """
+    if is_current(CATEGORIES_PATH):
+        return pl.read_ipc(CATEGORIES_PATH, memory_map=True)
 
-DEFAULT_LOCAL_PATH = Path().resolve() / 'data'
-DATA_DIR = os.getenv('DATA_DIR', DEFAULT_LOCAL_PATH)
-DATA_PATH = DATA_DIR / 'combined_data.parquet'
+    return build_categories_table()
 
 
-def get_lf() -> pl.LazyFrame:
-    """Loads the combined data from the parquet file as a LazyFrame."""
-    return pl.scan_parquet(DATA_PATH)
+# The categories table never changes while the app runs, so it is loaded once
+# when each worker imports this module
+_CATEGORIES_TABLE: Final[pl.DataFrame] = load_categories_table()
+_CATEGORIES_COLUMNS: Final[dict[str, list]] = _CATEGORIES_TABLE.to_dict(as_series=False)
 
 
-@cache
 def get_categories_table() -> pl.DataFrame:
     """Get the initial categories table with group codes and names."""
-    lf = (
-        get_lf()
-        # Extract relevant columns and unique entries
-        .select(['Group Code', 'Group Name'])
-        .unique()
-        .filter(pl.col('Group Code').str.contains(r'^\d+(\.\d+)*\.?$'))  # Remove group codes that don't look like x.y.z
-
-        # Sort lexicographically by group code
-        .with_columns(
-            pl.col("Group Code")
-            .str.strip_chars(".")
-            .str.split(".")
-            .list.eval(pl.element().cast(pl.Int64))
-            .alias("_sort_key")
-        )
-        .sort("_sort_key")
-        .drop("_sort_key")
-
-        # Add initial values for the input table
-        .with_columns([
-            pl.lit(None, dtype=pl.Float32).alias('Use level (mg/kg)'),
-            pl.lit(False, dtype=pl.Boolean).alias('Consumers of')
-        ])
-    )
-
-    return lf.collect()
+    return _CATEGORIES_TABLE
+
+
+def get_categories_columns() -> dict[str, list]:
+    """Get the categories table as a dict of column lists.
+
+    The lists are shared between callers and must not be mutated.
+    """
+    return _CATEGORIES_COLUMNS
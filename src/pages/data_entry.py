@@ -3,19 +3,87 @@ Data entry page
 """
 import base64
 from datetime import date
-import json
-
-from dash import html, dcc, dash_table, exceptions, callback, Input, Output, State
-
-from data import get_categories_table
-
-__all__ = ['layout']
+import io
+
+from dash import Dash, html, dcc, dash_table, exceptions, Input, Output, State
+import polars as pl
+
+from data import get_categories_columns, get_categories_table
+from session import SESSION_SCHEMA, decode_session_data, encode_session_data, is_session_data
+
+__all__ = ['layout', 'register_callbacks']
+
+
+# Schema of the input table data
+TABLE_SCHEMA = {
+    'Group Code': pl.String,
+    'Group Name': pl.String,
+    'Use level (mg/kg)': pl.Float64,
+    'Consumers of': pl.Boolean,
+}
+
+# Rows with a use level entered. Missing use levels are null, which compares as
+# null and so counts as false in filters, conditions and any().
+HAS_USE_LEVEL = pl.col('Use level (mg/kg)') > 0
+
+# Input table configuration, shared by every layout. Dash only reads these when
+# serializing the layout, so they must not be mutated.
+TABLE_STYLE_CELL = {
+    "textAlign": "left",
+    "whiteSpace": "normal",
+    "height": "auto",
+}
+
+TABLE_STYLE_CELL_CONDITIONAL = [
+    {"if": {"column_id": "Group Code"}, "width": "120px"},
+    {"if": {"column_id": "Group Name"}, "width": "300px"},
+]
+
+TABLE_COLUMNS = [
+    {
+        "name": "Group code",
+        "id": "Group Code",
+        "editable": False,
+    },
+    {
+        "name": "Group name",
+        "id": "Group Name",
+        "editable": False,
+    },
+    {
+        "name": "Use level (mg/kg)",
+        "id": "Use level (mg/kg)",
+        "type": "numeric",
+        "editable": True,
+        "validation": {
+            "allow_null": True,
+            "default": None,
+        },
+    },
+    {
+        "name": "Consumers of",
+        "id": "Consumers of",
+        "presentation": "dropdown",
+        "editable": True,
+    },
+]
+
+TABLE_DROPDOWN = {
+    "Consumers of": {
+        "options": [
+            {"label": "Yes", "value": True},
+            {"label": "No", "value": False},
+        ]
+    }
+}
 
 
-def layout(session_data: list[dict] = None) -> html.Div:
-    """Data entry page layout."""
-    table_data = session_data_to_table_data(session_data)
+def layout() -> html.Div:
+    """Data entry page layout.
 
+    The table starts from the categories table, restore_table fills in any
+    session data when the page loads.
+    """
     return html.Div(
         [
             html.P(
@@ -44,67 +112,23 @@ def layout(session_data: list[dict] = None) -> html.Div:
                 style={"display": "flex", "gap": "10px", "marginBottom": "15px"},
             ),
 
+            # The table data is sent in columnar form and expanded into rows
+            # client side, see register_callbacks
+            dcc.Store(id="input-table-columns", data=get_categories_columns()),
             dash_table.DataTable(
                 id="input-table",
-                data=table_data,
+                data=[],
                 editable=True,
                 row_deletable=False,
-                style_cell={
-                    "textAlign": "left",
-                    "whiteSpace": "normal",
-                    "height": "auto",
-                },
-                style_cell_conditional=[
-                    {"if": {"column_id": "Group Code"}, "width": "120px"},
-                    {"if": {"column_id": "Group Name"}, "width": "300px"},
-                ],
-                columns=[
-                    {
-                        "name": "Group code",
-                        "id": "Group Code",
-                        "editable": False,
-                    },
-                    {
-                        "name": "Group name",
-                        "id": "Group Name",
-                        "editable": False,
-                    },
-                    {
-                        "name": "Use level (mg/kg)",
-                        "id": "Use level (mg/kg)",
-                        "type": "numeric",
-                        "editable": True,
-                        "validation": {
-                            "allow_null": True,
-                            "default": None,
-                        },
-                    },
-                    {
-                        "name": "Consumers of",
-                        "id": "Consumers of",
-                        "presentation": "dropdown",
-                        "editable": True,
-                    },
-                ],
-                dropdown={
-                    "Consumers of": {
-                        "options": [
-                            {"label": "Yes", "value": True},
-                            {"label": "No", "value": False},
-                        ]
-                    }
-                },
+                style_cell=TABLE_STYLE_CELL,
+                style_cell_conditional=TABLE_STYLE_CELL_CONDITIONAL,
+                columns=TABLE_COLUMNS,
+                dropdown=TABLE_DROPDOWN,
             ),
         ]
     )
 
 
-@callback(
-    Output("btn-calculate", "disabled", allow_duplicate=True),
-    Output("input-table", "data", allow_duplicate=True),
-    Input("input-table", "data"),
-    prevent_initial_call='initial_duplicate',
-)
 def validate_table(table_data) -> tuple[bool, list[dict]]:
     """Validate the input table data.
 
@@ -113,27 +137,23 @@ def validate_table(table_data) -> tuple[bool, list[dict]]:
         "Calculate exposure" button, and the second element is the validated table
         data.
     """
-    # Enable "Calculate exposure" only if at least one row has Use level > 0
-    enable_calculate = any(
-        row.get("Use level (mg/kg)") is not None and row.get("Use level (mg/kg)") > 0
-        for row in table_data
-    )
+    df = pl.DataFrame(table_data, schema=TABLE_SCHEMA)
 
     # Clear "Consumers of" if [Use level] <= 0
-    for row in table_data:
-        if row.get("Use level (mg/kg)") is None or row.get("Use level (mg/kg)") <= 0:
-            row["Consumers of"] = False
+    df = df.with_columns(
+        pl.when(HAS_USE_LEVEL)
+        .then(pl.col("Consumers of"))
+        .otherwise(False)
+        .alias("Consumers of")
+    )
+
+    # Enable "Calculate exposure" only if at least one row has Use level > 0
+    enable_calculate = df.select(HAS_USE_LEVEL.any()).item()
 
-    return not enable_calculate, table_data
+    return not enable_calculate, df.to_dicts()
 
 
-@callback(
-    Output("btn-calculate", "disabled"),
-    Output("input-table", "data"),
-    Input("btn-reset", "n_clicks"),
-    prevent_initial_call=True,
-)
-def clear_table(_) -> tuple[bool, list[dict]]:
+def clear_table(_) -> tuple[bool, dict[str, list]]:
     """Reset the input table to its initial state.
 
     Returns:
@@ -141,92 +161,102 @@ def clear_table(_) -> tuple[bool, list[dict]]:
         "Calculate exposure" button, and the second element is the reset table
         data loaded from the categories table.
     """
-    reset_data = get_categories_table().to_dicts()
+    reset_data = get_categories_columns()
     return True, reset_data
 
 
-def table_data_to_session_data(table_data: list[dict]) -> list[dict]:
-    """Convert table input data into a minified session data object."""
-    # We create a list of dicts with only the relevant fields and valid use levels
-    return [
-        {
-            'group_code': row['Group Code'],
-            'use_level': row['Use level (mg/kg)'],
-            'consumers_of': row['Consumers of']
-        }
-        for row in table_data
-        if row['Use level (mg/kg)'] is not None and row['Use level (mg/kg)'] > 0
-    ]
+def restore_table(_, session_data: dict) -> dict[str, list]:
+    """Restore the input table from the session data when the page is loaded.
 
+    The URL doesn't change when switching tabs, so this only runs on page load.
+    Data saved after that was taken from the table, so it is already shown.
+    """
+    if not is_session_data(session_data):
+        raise exceptions.PreventUpdate
 
-def session_data_to_table_data(session_data: list[dict] = None) -> list[dict]:
-    """Convert session input data back to table data format."""
-    table_data = get_categories_table().to_dicts()
-    if not session_data:
-        return table_data
+    return session_data_to_table_data(session_data)
 
-    session_data_map = {item['group_code']: item for item in session_data}
 
-    for row in table_data:
-        group_code = row['Group Code']
-        if group_code in session_data_map:
-            row['Use level (mg/kg)'] = session_data_map[group_code]['use_level']
-            row['Consumers of'] = session_data_map[group_code]['consumers_of']
-        else:
-            row['Use level (mg/kg)'] = None
-            row['Consumers of'] = False
+def table_data_to_session_df(table_data: list[dict]) -> pl.DataFrame:
+    """Convert table input data into a minified session data frame."""
+    # We keep only the relevant fields and rows with valid use levels
+    return (
+        pl.DataFrame(table_data, schema=TABLE_SCHEMA)
+        .filter(HAS_USE_LEVEL)
+        .select([
+            pl.col('Group Code').alias('group_code'),
+            pl.col('Use level (mg/kg)').alias('use_level'),
+            pl.col('Consumers of').alias('consumers_of'),
+        ])
+    )
 
-    return table_data
+
+def session_data_to_table_data(session_data: dict = None) -> dict[str, list]:
+    """Convert session input data back to columnar table data."""
+    if not is_session_data(session_data):
+        return get_categories_columns()
+
+    return session_df_to_table_data(decode_session_data(session_data))
+
+
+def session_df_to_table_data(session_df: pl.DataFrame) -> dict[str, list]:
+    """Merge a DataFrame of session input data into columnar table data."""
+    session_df = session_df.unique('group_code', keep='last', maintain_order=True)
+
+    table_df = (
+        get_categories_table()
+        .drop(['Use level (mg/kg)', 'Consumers of'])
+        .join(
+            session_df,
+            left_on='Group Code',
+            right_on='group_code',
+            how='left',
+            maintain_order='left',
+        )
+        .select([
+            'Group Code',
+            'Group Name',
+            pl.col('use_level').alias('Use level (mg/kg)'),
+            pl.col('consumers_of').fill_null(False).alias('Consumers of'),
+        ])
+    )
+
+    return table_df.to_dict(as_series=False)
 
 
-@callback(
-    Output('input-table', 'data', allow_duplicate=True),
-    Input('import-inputs', 'contents'),
-    config_prevent_initial_callbacks=True
-)
 def import_placeholder(contents: str):
     """Import input data from a JSON file"""
     # Placeholder for future file upload logic
     if contents is None:
-        data = []
-    else:
-        content_type, content_string = contents.split(',')
-        decoded = base64.b64decode(content_string)
-        data = json.loads(decoded)
+        return session_data_to_table_data(None)
+
+    content_type, content_string = contents.split(',')
+    decoded = base64.b64decode(content_string)
+    try:
+        session_df = pl.read_json(io.BytesIO(decoded), schema=SESSION_SCHEMA)
+    except pl.exceptions.ComputeError:
+        # Leave the table as it is if the file doesn't match the session schema
+        raise exceptions.PreventUpdate
 
-    table_data = session_data_to_table_data(data)
+    table_data = session_df_to_table_data(session_df)
     return table_data
 
 
-@callback(
-    Output('export-inputs', "data"),
-    Input("btn-export", "n_clicks"),
-    State("input-table", "data"),
-    prevent_initial_call=True,
-)
 def export_placeholder(_, data):
     """Export input data to a JSON file.
 
     Returns the file content and filename.
     """
     # Placeholder for future file export logic
-    exposure_input = table_data_to_session_data(data)
+    exposure_input = table_data_to_session_df(data)
     filename = f'exposure_input_{date.today().strftime('%Y-%m-%d')}.json'
     return {
-        'content': json.dumps(exposure_input),
+        'content': exposure_input.write_json(),
         'filename': 'exposure_input.json',
     }
 
 
-@callback(
-    Output("session-input-data", "data"),
-    Output("results-tab", "disabled"),
-    Output("navigation-tabs", "value"),
-    Input("btn-calculate", "n_clicks"),
-    State("input-table", "data"),
-    prevent_initial_call=True,
-)
-def calculate_exposure(n_clicks, table_data) -> tuple[list[dict], bool, str]:
+def calculate_exposure(n_clicks, table_data) -> tuple[dict, bool, str]:
     """Save input data to session storage and enable results tab.
 
     Args:
@@ -242,5 +272,70 @@ def calculate_exposure(n_clicks, table_data) -> tuple[list[dict], bool, str]:
     if n_clicks is None:
         raise exceptions.PreventUpdate
 
-    session_data = table_data_to_session_data(table_data)
+    session_data = encode_session_data(table_data_to_session_df(table_data))
     return session_data, False, "exposure-results"
+
+
+def register_callbacks(app: Dash) -> None:
+    """Register the data entry page callbacks with the app."""
+    app.callback(
+        Output("btn-calculate", "disabled", allow_duplicate=True),
+        Output("input-table", "data", allow_duplicate=True),
+        Input("input-table", "data"),
+        prevent_initial_call='initial_duplicate',
+    )(validate_table)
+
+    # Expand the columnar table data into the rows expected by the DataTable
+    app.clientside_callback(
+        """
+        function(columns) {
+            if (!columns) {
+                return window.dash_clientside.no_update;
+            }
+            const names = Object.keys(columns);
+            const length = names.length ? columns[names[0]].length : 0;
+            return Array.from({length}, (_, i) =>
+                Object.fromEntries(names.map(name => [name, columns[name][i]]))
+            );
+        }
+        """,
+        Output("input-table", "data", allow_duplicate=True),
+        Input("input-table-columns", "data"),
+        prevent_initial_call='initial_duplicate',
+    )
+
+    app.callback(
+        Output("btn-calculate", "disabled"),
+        Output("input-table-columns", "data"),
+        Input("btn-reset", "n_clicks"),
+        prevent_initial_call=True,
+    )(clear_table)
+
+    app.callback(
+        Output("input-table-columns", "data", allow_duplicate=True),
+        Input("url", "pathname"),
+        State("session-input-data", "data"),
+        prevent_initial_call='initial_duplicate',
+    )(restore_table)
+
+    app.callback(
+        Output('input-table-columns', 'data', allow_duplicate=True),
+        Input('import-inputs', 'contents'),
+        prevent_initial_call=True,
+    )(import_placeholder)
+
+    app.callback(
+        Output('export-inputs', "data"),
+        Input("btn-export", "n_clicks"),
+        State("input-table", "data"),
+        prevent_initial_call=True,
+    )(export_placeholder)
+
+    app.callback(
+        Output("session-input-data", "data"),
+        Output("results-tab", "disabled"),
+        Output("navigation-tabs", "value"),
+        Input("btn-calculate", "n_clicks"),
+        State("input-table", "data"),
+        prevent_initial_call=True,
+    )(calculate_exposure)
@@ -0,0 +1,22 @@
+"""
+Factory for result panes with static content.
+"""
+from dash import html
+
+__all__ = ["make_static_pane"]
+
+
+PLACEHOLDER_TEXT = (
+    "This section provides a summary of the exposure assessment results. "
+    "Detailed results and graphs can be found in the respective tabs."
+)
+
+
+def make_static_pane(title: str, text: str = PLACEHOLDER_TEXT) -> html.Div:
+    """Build a pane with a title and a paragraph of text."""
+    return html.Div(
+        [
+            html.H3(title),
+            html.P(text),
+        ]
+    )
@@ -3,17 +3,11 @@ The Average Exposure Graph pane layout.
 """
 from dash import html
 
+from ._static import make_static_pane
+
 __all__ = ["layout"]
 
 
-def layout(session_data: list[dict]) -> html.Div:
+def layout(session_data: dict) -> html.Div:
     """Graph Average Exposure page layout."""
-    return html.Div(
-        [
-            html.H3("Graph Average Exposure"),
-            html.P(
-                "This section provides a summary of the exposure assessment results. "
-                "Detailed results and graphs can be found in the respective tabs."
-            ),
-        ]
-    )
+    return make_static_pane("Graph Average Exposure")
@@ -3,17 +3,11 @@ The Graph 97.5th Percentile Exposure pane layout.
 """
 from dash import html
 
+from ._static import make_static_pane
+
 __all__ = ["layout"]
 
 
-def layout(session_data: list[dict]) -> html.Div:
+def layout(session_data: dict) -> html.Div:
     """97.5th Percentile Exposure page layout."""
-    return html.Div(
-        [
-            html.H3("97.5th Percentile Exposure Graph"),
-            html.P(
-                "This section provides a summary of the exposure assessment results. "
-                "Detailed results and graphs can be found in the respective tabs."
-            ),
-        ]
-    )
+    return make_static_pane("97.5th Percentile Exposure Graph")
@@ -1,53 +1,61 @@
 """
 Results page layout with sub-tabs for exposure analysis.
 """
-from dash import html, dcc, Input, Output, callback
+from dash import Dash, html, dcc, Input, Output, State
+from plotly.io.json import to_json_plotly
 
 from .panes import exposure_results, graph_p975_exposure, graph_average_exposure, exposure_summary
 
-__all__ = ['layout']
-
-
-# Define the tabs and their corresponding actions
-tabs = {
-    'exposure-summary': {
-        'title': 'Exposure summary',
-        'action': exposure_summary
-    },
-    'exposure-results': {
-        'title': 'Exposure results',
-        'action': exposure_results
-    },
-    'graph-average-exposure': {
-        'title': 'Graph average exposure',
-        'action': graph_average_exposure
-    },
-    'graph-p975-exposure': {
-        'title': 'Graph 97.5ᵗʰ percentile exposure',
-        'action': graph_p975_exposure
-    }
-}
-
-
-def layout(session_data: list[dict]) -> html.Div:
-    return html.Div([
-        dcc.Tabs(id="results-sub-tabs", value="exposure-summary", children=[
-            dcc.Tab(label=data['title'], value=value) for value, data in tabs.items()
-        ]),
-        html.Div(id="sub-tab-content")
-    ])
-
-
-@callback(
-    Output("sub-tab-content", "children"),
-    Input("results-sub-tabs", "value"),
-    Input("session-input-data", "data")
+__all__ = ['layout', 'register_callbacks']
+
+
+# Define the tabs as (tab id, title, pane layout)
+TABS = (
+    ('exposure-summary', 'Exposure summary', exposure_summary.layout),
+    ('exposure-results', 'Exposure results', exposure_results.layout),
+    ('graph-average-exposure', 'Graph average exposure', graph_average_exposure.layout),
+    ('graph-p975-exposure', 'Graph 97.5ᵗʰ percentile exposure', graph_p975_exposure.layout),
 )
-def render_sub_tab(tab, session_data: list[dict]) -> html.Div:
-    if not session_data:
-        raise ValueError('Data is required')
 
-    if tab not in tabs.keys():
-        raise ValueError('Tab not found')
 
-    return tabs[tab]['action'].layout(session_data)
+# All panes are sent to the browser with the page and switched client side. They
+# are serialized to JSON once here, so serving the layout only has to encode a
+# string rather than walk every pane's component tree.
+_PANES_JSON = to_json_plotly({
+    value: pane_layout(None) for value, _, pane_layout in TABS
+})
+
+# The page shell only depends on the tabs, so it is only built once
+_LAYOUT = html.Div([
+    dcc.Store(id="results-panes", data=_PANES_JSON),
+    dcc.Tabs(id="results-sub-tabs", value="exposure-summary", children=[
+        dcc.Tab(label=title, value=value) for value, title, _ in TABS
+    ]),
+    html.Div(id="sub-tab-content")
+])
+
+
+def layout(session_data: dict = None) -> html.Div:
+    return _LAYOUT
+
+
+def register_callbacks(app: Dash) -> None:
+    """Register the results page callbacks with the app."""
+    # None of the panes change with the session data. A pane that does should
+    # update its own content in a separate callback on the session data. The
+    # panes are parsed on the first switch and reused until the store changes.
+    app.clientside_callback(
+        """
+        function(tab, panes) {
+            const cache = window.resultsPanesCache ||= {};
+            if (cache.json !== panes) {
+                cache.json = panes;
+                cache.panes = JSON.parse(panes);
+            }
+            return cache.panes[tab] || window.dash_clientside.no_update;
+        }
+        """,
+        Output("sub-tab-content", "children"),
+        Input("results-sub-tabs", "value"),
+        State("results-panes", "data"),
+    )
@@ -0,0 +1,39 @@
+"""
+Module for encoding the user input data kept in session storage.
+
+The input data is stored as a base64 encoded Arrow IPC stream rather than a
+list of dicts, which is smaller and faster to parse.
+"""
+import base64
+import io
+
+import polars as pl
+
+
+# Schema of the minified session data
+SESSION_SCHEMA = {
+    'group_code': pl.String,
+    'use_level': pl.Float64,
+    'consumers_of': pl.Boolean,
+}
+
+
+def encode_session_data(session_df: pl.DataFrame) -> dict:
+    """Encode session input data for session storage."""
+    buffer = io.BytesIO()
+    session_df.write_ipc_stream(buffer, compression='lz4')
+    return {'ipc': base64.b64encode(buffer.getvalue()).decode()}
+
+
+def is_session_data(session_data) -> bool:
+    """Check whether session storage holds encoded input data.
+
+    Sessions saved before the data was encoded hold a list of dicts, which is
+    treated as no data.
+    """
+    return isinstance(session_data, dict) and 'ipc' in session_data
+
+
+def decode_session_data(session_data: dict) -> pl.DataFrame:
+    """Decode session input data from session storage."""
+    return pl.read_ipc_stream(io.BytesIO(base64.b64decode(session_data['ipc'])))
@@ -0,0 +1,48 @@
+"""
+Precompute the categories table from the combined data.
+
+Writes an Arrow IPC artifact (loaded by `data.load_categories_table`) and a JSON
+copy of the table rows next to the parquet file. Run with:
+
+    python tools/build_categories.py [--rebuild]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from combined_data import (  # noqa: E402
+    CATEGORIES_JSON_PATH,
+    CATEGORIES_PATH,
+    build_categories_table,
+    is_current,
+    write_source_stamp,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Precompute the categories table.')
+    parser.add_argument(
+        '--rebuild',
+        action='store_true',
+        help='Rebuild the artifacts from the parquet file even if they are up to date',
+    )
+    args = parser.parse_args()
+
+    if is_current(CATEGORIES_PATH) and not args.rebuild:
+        print(f'{CATEGORIES_PATH} is up to date, use --rebuild to force')
+        return
+
+    df = build_categories_table()
+    df.write_ipc(CATEGORIES_PATH, compression='uncompressed')
+    with open(CATEGORIES_JSON_PATH, 'w') as f:
+        json.dump(df.to_dicts(), f)
+    write_source_stamp(CATEGORIES_PATH)
+
+    print(f'Wrote {df.height} categories to {CATEGORIES_PATH} and {CATEGORIES_JSON_PATH}')
+
+
+if __name__ == '__main__':
+    main()
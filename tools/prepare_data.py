@@ -0,0 +1,45 @@
+"""
+Write a copy of the combined data sorted by group code as Arrow IPC.
+
+The app reads the copy when it is up to date. It is uncompressed and memory
+mapped, so no parquet decoding is needed on startup, and the categories
+table only needs to keep the first occurrence of each group instead of
+sorting. Run with:
+
+    python tools/prepare_data.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+import polars as pl  # noqa: E402
+
+from combined_data import (  # noqa: E402
+    DATA_PATH,
+    SORTED_DATA_PATH,
+    group_code_segment_width,
+    group_code_sort_key,
+    write_source_stamp,
+)
+
+
+def main() -> None:
+    lf = pl.scan_parquet(DATA_PATH)
+    width = group_code_segment_width(lf)
+
+    (
+        lf
+        .with_columns(group_code_sort_key(width).alias('_sort_key'))
+        .sort('_sort_key', maintain_order=True)
+        .drop('_sort_key')
+        .sink_ipc(SORTED_DATA_PATH, compression='uncompressed')
+    )
+    write_source_stamp(SORTED_DATA_PATH)
+
+    print(f'Wrote sorted data to {SORTED_DATA_PATH}')
+    print('Rebuild the categories table with: python tools/build_categories.py --rebuild')
+
+
+if __name__ == '__main__':
+    main()
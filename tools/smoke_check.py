@@ -0,0 +1,43 @@
+"""
+Check that the app can be created and serves its layout and callbacks.
+
+Imports the app the way gunicorn does, requests the layout and callback
+dependencies through the Flask test client, and checks that a second app from
+create_app serves the same callbacks. Run with:
+
+    python tools/smoke_check.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from app import create_app, server  # noqa: E402
+
+
+def get_json(client, path: str):
+    """Request a Dash endpoint, exiting if it fails."""
+    response = client.get(path)
+    if response.status_code != 200:
+        sys.exit(f'{path} returned {response.status_code}')
+
+    return response.get_json()
+
+
+def main() -> None:
+    client = server.test_client()
+    get_json(client, '/_dash-layout')
+    callbacks = get_json(client, '/_dash-dependencies')
+
+    other_callbacks = get_json(create_app().server.test_client(), '/_dash-dependencies')
+    if len(other_callbacks) != len(callbacks):
+        sys.exit(
+            f'create_app served {len(other_callbacks)} callbacks, '
+            f'the module app serves {len(callbacks)}'
+        )
+
+    print(f'The app serves its layout and {len(callbacks)} callbacks')
+
+
+if __name__ == '__main__':
+    main()